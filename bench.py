@@ -0,0 +1,114 @@
+"""Micro-benchmarks for the shooter's hot paths.
+
+    python bench.py present          # present modes at 1080p and 4K
+    python bench.py present --frames 600
+    python bench.py crowd            # enemy tick cost vs. crowd size
+
+Set SDL_VIDEODRIVER=dummy to run headless (numbers then exclude the GPU/compositor).
+"""
+import argparse
+import random
+import time
+
+import pygame
+
+import main
+
+WINDOW_SIZES = {"1080p": (1920, 1080), "4K": (3840, 2160)}
+
+
+def bench_present(mode, window_size, canvas_alpha, frames):
+    game = main.Game(present_mode=mode, canvas_alpha=canvas_alpha, window_size=window_size)
+    if mode == "scaled":
+        # SCALED picks its own window size; stretch it to the target afterwards
+        from pygame._sdl2.video import Window
+
+        Window.from_display_module().size = window_size
+    for _ in range(40):
+        game.spawn_enemy()
+    game.draw_scene()
+    game.blit_to_window()  # warm-up: first present allocates driver-side buffers
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.blit_to_window()
+    elapsed = time.perf_counter() - start
+    del game
+    pygame.display.quit()
+    return elapsed / frames * 1000.0
+
+
+def run_present(frames):
+    print(f"{'mode':<8} {'canvas':<7} {'window':<6} {'ms/frame':>9}")
+    for mode in main.PRESENT_MODES:
+        for canvas_alpha in (True, False):
+            for label, size in WINDOW_SIZES.items():
+                canvas = "alpha" if canvas_alpha else "opaque"
+                try:
+                    ms = bench_present(mode, size, canvas_alpha, frames)
+                except (pygame.error, ImportError) as exc:
+                    print(f"{mode:<8} {canvas:<7} {label:<6} {'n/a':>9}  ({exc})")
+                    continue
+                print(f"{mode:<8} {canvas:<7} {label:<6} {ms:9.3f}")
+
+
+def make_crowd(count, side):
+    random.seed(count)
+    kinds = ("chaser", "sprinter", "tank")
+    return [main.Enemy(random.choice(kinds), (random.uniform(0, side), random.uniform(0, side)))
+            for _ in range(count)]
+
+
+def time_ticks(enemies, player_pos, grid, ticks):
+    dt = 1.0 / main.FPS
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if grid is not None:
+            grid.rebuild(enemies)
+        for e in enemies:
+            e.update(dt, player_pos, [], grid)
+    return (time.perf_counter() - start) / ticks * 1000.0
+
+
+def bench_crowd(count, separation, ticks, density):
+    # grow the arena with the crowd so neighbours per enemy stay constant
+    side = (count / density) ** 0.5
+    enemies = make_crowd(count, side)
+    grid = main.SpatialGrid() if separation else None
+    return time_ticks(enemies, pygame.Vector2(side / 2, side / 2), grid, ticks)
+
+
+def bench_swarm(count, ticks, settle):
+    # the in-game case: everyone has converged on a fixed player
+    enemies = make_crowd(count, main.VIRTUAL_H)
+    grid = main.SpatialGrid()
+    player_pos = pygame.Vector2(main.VIRTUAL_H / 2, main.VIRTUAL_H / 2)
+    time_ticks(enemies, player_pos, grid, settle)
+    return time_ticks(enemies, player_pos, grid, ticks)
+
+
+def run_crowd(counts, ticks, density, settle):
+    print(f"{'enemies':>7} {'seek ms':>9} {'sep ms':>9} {'sep us/enemy':>13} {'swarm ms':>9} {'swarm us/enemy':>15}")
+    for n in counts:
+        seek = bench_crowd(n, False, ticks, density)
+        sep = bench_crowd(n, True, ticks, density)
+        swarm = bench_swarm(n, ticks, settle)
+        print(f"{n:7d} {seek:9.3f} {sep:9.3f} {sep / n * 1000.0:13.2f} {swarm:9.3f} {swarm / n * 1000.0:15.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="bench", required=True)
+    p = sub.add_parser("present", help="cost of blit_to_window per present mode")
+    p.add_argument("--frames", type=int, default=300)
+    c = sub.add_parser("crowd", help="cost of one enemy tick: spread out (with/without separation) and converged")
+    c.add_argument("--counts", type=int, nargs="+", default=[100, 250, 500, 1000, 2000, 4000])
+    c.add_argument("--ticks", type=int, default=30)
+    c.add_argument("--density", type=float, default=1 / 1000.0,
+                   help="enemies per square pixel (default: one per 1000 px^2)")
+    c.add_argument("--settle", type=int, default=600,
+                   help="ticks the swarm runs toward the player before the converged case is timed")
+    args = parser.parse_args()
+    if args.bench == "present":
+        run_present(args.frames)
+    elif args.bench == "crowd":
+        run_crowd(args.counts, args.ticks, args.density, args.settle)
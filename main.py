@@ -1,7 +1,10 @@
+import argparse
+import atexit
 import math
 import random
 import sys
-from typing import List
+import time
+from typing import List, Optional
 
 import pygame
 
@@ -11,6 +14,23 @@ import pygame
 VIRTUAL_W, VIRTUAL_H = 960, 540  # base canvas; will scale to window
 FPS = 120
 
+# How the virtual canvas reaches the window:
+#   "smooth"  - letterboxed smoothscale (default, softest look)
+#   "integer" - letterboxed nearest-neighbour at the largest whole factor
+#   "scaled"  - let SDL scale the window (pygame.SCALED)
+#   "sdl2"    - upload to a streaming texture and let the renderer scale it
+PRESENT_MODES = ("smooth", "integer", "scaled", "sdl2")
+PRESENT_MODE = "smooth"
+SDL_BLENDMODE_NONE, SDL_BLENDMODE_BLEND = 0, 1  # texture blend modes for the "sdl2" path
+CANVAS_ALPHA = True  # False drops SRCALPHA on the main canvas (cheaper blits/scales)
+
+# Crowd separation: each enemy pushes away from neighbours closer than
+# radius * SEPARATION_RANGE, weighted against seeking the player.
+SEPARATION_RANGE = 2.0
+SEPARATION_WEIGHT = 1.4
+SEPARATION_MAX_NEIGHBOURS = 8  # bounds per-enemy work once a swarm has converged
+GRID_CELL = 16  # small cells so the nearest neighbours are found first
+
 WHITE = (240, 240, 240)
 BLACK = (10, 10, 12)
 GRAY = (80, 80, 90)
@@ -125,6 +145,38 @@ class Barrier:
         return False
 
 
+# ---------------------------
+# Spatial grid (rebuilt every tick for neighbour queries)
+# ---------------------------
+class SpatialGrid:
+    def __init__(self, cell=GRID_CELL):
+        self.cell = cell
+        self.cells = {}
+        self.ring_offsets = {}
+
+    def rebuild(self, items):
+        cells = {}
+        cell = self.cell
+        for it in items:
+            key = (int(it.pos.x // cell), int(it.pos.y // cell))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [it]
+            else:
+                bucket.append(it)
+        self.cells = cells
+
+    def offsets(self, radius):
+        """Cell offsets covering radius, ordered ring by ring outward from the centre cell."""
+        rings = int(math.ceil(radius / self.cell))
+        offs = self.ring_offsets.get(rings)
+        if offs is None:
+            offs = [(ox, oy) for ox in range(-rings, rings + 1) for oy in range(-rings, rings + 1)]
+            offs.sort(key=lambda o: max(abs(o[0]), abs(o[1])))
+            self.ring_offsets[rings] = offs
+        return offs
+
+
 # ---------------------------
 # Entities
 # ---------------------------
@@ -172,16 +224,59 @@ class Enemy:
             self.damage = 16
         self.alive = True
 
-    def update(self, dt, player_pos, barriers: List[Barrier]):
+    def update(self, dt, player_pos, barriers: List[Barrier], grid: Optional[SpatialGrid] = None):
         dir = (player_pos - self.pos)
         dist = dir.length() + 1e-5
         dir = dir / dist
+        if grid is not None:
+            sx, sy = self.separation(grid)
+            if sx or sy:
+                dir.x += sx * SEPARATION_WEIGHT
+                dir.y += sy * SEPARATION_WEIGHT
+                if dir.length_squared() > 1.0:
+                    dir.normalize_ip()
         self.vel = dir * self.speed
         self.pos += self.vel * dt
         # collide with barriers
         for b in barriers:
             Barrier.resolve_circle_collision(self.pos, self.radius, b.rect)
 
+    def separation(self, grid: SpatialGrid):
+        # boids-style: push away from close neighbours, stronger the closer they are.
+        # Cells are scanned nearest ring first, so stopping after
+        # SEPARATION_MAX_NEIGHBOURS keeps roughly the closest ones.
+        px, py = self.pos.x, self.pos.y
+        rng = self.radius * SEPARATION_RANGE
+        rng_sq = rng * rng
+        cells = grid.cells
+        cx, cy = int(px // grid.cell), int(py // grid.cell)
+        sx = sy = 0.0
+        found = 0
+        for ox, oy in grid.offsets(rng):
+            bucket = cells.get((cx + ox, cy + oy))
+            if not bucket:
+                continue
+            for other in bucket:
+                dx = px - other.pos.x
+                dy = py - other.pos.y
+                d_sq = dx * dx + dy * dy
+                if d_sq >= rng_sq or other is self:
+                    continue
+                if d_sq < 1e-6:
+                    # stacked exactly: nudge in a random direction
+                    ang = random.uniform(0, math.tau)
+                    sx += math.cos(ang)
+                    sy += math.sin(ang)
+                else:
+                    d = math.sqrt(d_sq)
+                    w = (1.0 - d / rng) / d
+                    sx += dx * w
+                    sy += dy * w
+                found += 1
+                if found >= SEPARATION_MAX_NEIGHBOURS:
+                    return sx, sy
+        return sx, sy
+
     def hit(self, dmg):
         self.hp -= dmg
         if self.hp <= 0:
@@ -300,11 +395,14 @@ class Player:
 # Game
 # ---------------------------
 class Game:
-    def __init__(self):
+    def __init__(self, present_mode=PRESENT_MODE, canvas_alpha=CANVAS_ALPHA, window_size=(VIRTUAL_W, VIRTUAL_H),
+                 telemetry=None):
         pygame.init()
         pygame.display.set_caption("Top‑Down Shooter — Survival")
-        self.window = pygame.display.set_mode((VIRTUAL_W, VIRTUAL_H), pygame.RESIZABLE | pygame.DOUBLEBUF)
-        self.surface = pygame.Surface((VIRTUAL_W, VIRTUAL_H), pygame.SRCALPHA)
+        self.present_mode = present_mode
+        self.canvas_alpha = canvas_alpha
+        self.telemetry = telemetry  # telemetry.RingBuffer or None
+        self.init_display(window_size)
         self.clock = pygame.time.Clock()
 
         self.camera = Camera()
@@ -314,11 +412,13 @@ class Game:
         self.enemies: List[Enemy] = []
         self.particles: List[Particle] = []
         self.barriers: List[Barrier] = []
+        self.enemy_grid = SpatialGrid()
 
         self.level = 1
         self.level_time_left = self.goal_time_for(self.level)
         self.time = 0.0
         self.spawn_timer = 0.0
+        self.spawns = 0
 
         # states: menu, playing, paused, cleared, gameover
         self.state = "menu"
@@ -373,15 +473,78 @@ class Game:
             self.player.hp = self.player.max_hp
         self.flash = 0.0
 
-    # ---------- Utility ----------
-    def world_mouse(self):
-        win_w, win_h = self.window.get_size()
+    # ---------- Display ----------
+    def init_display(self, window_size):
+        if self.present_mode not in PRESENT_MODES:
+            raise ValueError(f"unknown present mode {self.present_mode!r}")
+        flags = pygame.SRCALPHA if self.canvas_alpha else 0
+        self.window = None
+        self.texture = None
+        if self.present_mode == "sdl2":
+            from pygame._sdl2.video import Renderer, Texture, Window
+
+            # keep the window across restarts instead of opening a new one
+            if getattr(self, "sdl_window", None) is None:
+                self.sdl_window = Window("Top‑Down Shooter — Survival", size=window_size, resizable=True)
+                self.renderer = Renderer(self.sdl_window)
+            self.renderer.draw_color = (5, 6, 10, 255)
+            self.surface = pygame.Surface((VIRTUAL_W, VIRTUAL_H), flags, 32)
+            self.texture = Texture(self.renderer, (VIRTUAL_W, VIRTUAL_H), streaming=True)
+            self.texture.blend_mode = SDL_BLENDMODE_BLEND if self.canvas_alpha else SDL_BLENDMODE_NONE
+            self.win_size = tuple(self.sdl_window.size)
+        elif self.present_mode == "scaled":
+            # a second SCALED set_mode fails to create its renderer, so reuse the
+            # display across restarts like the sdl2 window above
+            if getattr(self, "scaled_display", False):
+                self.window = pygame.display.get_surface()
+            if self.window is None:
+                self.window = pygame.display.set_mode((VIRTUAL_W, VIRTUAL_H), pygame.SCALED | pygame.RESIZABLE)
+                self.scaled_display = True
+            # SDL scales the window for us; an opaque canvas can be the window itself
+            if self.canvas_alpha:
+                self.surface = pygame.Surface((VIRTUAL_W, VIRTUAL_H), flags).convert_alpha()
+            else:
+                self.surface = self.window
+            self.win_size = (VIRTUAL_W, VIRTUAL_H)
+        else:
+            self.window = pygame.display.set_mode(window_size, pygame.RESIZABLE | pygame.DOUBLEBUF)
+            self.surface = pygame.Surface((VIRTUAL_W, VIRTUAL_H), flags)
+            self.surface = self.surface.convert_alpha() if self.canvas_alpha else self.surface.convert()
+            self.win_size = self.window.get_size()
+        self.update_present_geometry()
+
+    def update_present_geometry(self):
+        """Recompute scale, letterbox rect and scale buffer; only needed on resize."""
+        win_w, win_h = self.win_size
         scale = min(win_w / VIRTUAL_W, win_h / VIRTUAL_H)
+        if self.present_mode == "scaled":
+            scale = 1.0  # SDL maps mouse coords back to the virtual canvas
+            win_w, win_h = VIRTUAL_W, VIRTUAL_H
+        elif self.present_mode == "integer" and scale >= 1:
+            scale = float(int(scale))
         surf_w, surf_h = int(VIRTUAL_W * scale), int(VIRTUAL_H * scale)
-        x_off = (win_w - surf_w) // 2
-        y_off = (win_h - surf_h) // 2
+        self.present_scale = scale
+        self.present_rect = pygame.Rect((win_w - surf_w) // 2, (win_h - surf_h) // 2, surf_w, surf_h)
+        self.scale_buf = None
+        if self.present_mode in ("smooth", "integer") and (surf_w, surf_h) != (VIRTUAL_W, VIRTUAL_H):
+            self.scale_buf = pygame.Surface((surf_w, surf_h), self.surface.get_flags() & pygame.SRCALPHA, self.surface)
+        if self.window is not None and self.present_mode != "scaled":
+            # letterbox bars only change with the geometry
+            self.window.fill((5, 6, 10))
+
+    def on_resize(self, size):
+        if self.present_mode == "sdl2":
+            self.win_size = tuple(self.sdl_window.size)
+        elif self.present_mode != "scaled":
+            self.window = pygame.display.get_surface()
+            self.win_size = size
+        self.update_present_geometry()
+
+    # ---------- Utility ----------
+    def world_mouse(self):
         mx, my = pygame.mouse.get_pos()
-        return ((mx - x_off) / scale, (my - y_off) / scale)
+        r = self.present_rect
+        return ((mx - r.x) / self.present_scale, (my - r.y) / self.present_scale)
 
     def spawn_enemy(self):
         margin = 40
@@ -404,6 +567,7 @@ class Game:
         else:
             kind = "chaser"
         self.enemies.append(Enemy(kind, pos))
+        self.spawns += 1
 
     # ---------- Effects ----------
     def add_explosion(self, pos, base_color):
@@ -432,11 +596,17 @@ class Game:
         while True:
             dt = self.clock.tick(FPS) / 1000.0
             self.bg_t += dt
+            if self.telemetry is not None:
+                p = self.player
+                self.telemetry.record((time.time(), dt * 1000.0, len(self.enemies), len(self.bullets),
+                                       len(self.particles), self.level, p.combo, p.hp, self.spawns))
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
+                if event.type == pygame.VIDEORESIZE:
+                    self.on_resize(event.size)
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         if self.state == "playing":
@@ -447,7 +617,7 @@ class Game:
                         if self.state == "menu":
                             self.state = "playing"
                         elif self.state == "gameover":
-                            self.__init__()
+                            self.__init__(self.present_mode, self.canvas_alpha, self.win_size, self.telemetry)
                         elif self.state == "cleared":
                             # ENTER -> next level
                             self.setup_level(self.level + 1, reset_player=True, refill_hp=True)
@@ -533,8 +703,9 @@ class Game:
             self.spawn_timer = spawn_interval
 
         # Update enemies
+        self.enemy_grid.rebuild(self.enemies)
         for e in self.enemies:
-            e.update(dt, self.player.pos, self.barriers)
+            e.update(dt, self.player.pos, self.barriers, self.enemy_grid)
 
         # Update bullets
         for b in self.bullets:
@@ -700,20 +871,62 @@ class Game:
 
     # ---------- Present ----------
     def blit_to_window(self):
-        win_w, win_h = self.window.get_size()
-        scale = min(win_w / VIRTUAL_W, win_h / VIRTUAL_H)
-        surf_w, surf_h = int(VIRTUAL_W * scale), int(VIRTUAL_H * scale)
-        x_off = (win_w - surf_w) // 2
-        y_off = (win_h - surf_h) // 2
-
         if self.player.shield > 0:
             self.player.shield = max(0.0, self.player.shield - self.clock.get_time() / 1000.0 * 0.25)
 
-        scaled = pygame.transform.smoothscale(self.surface, (surf_w, surf_h))
-        self.window.fill((5, 6, 10))
-        self.window.blit(scaled, (x_off, y_off))
+        if self.present_mode == "sdl2":
+            self.texture.update(self.surface)
+            self.renderer.clear()
+            self.texture.draw(dstrect=self.present_rect)
+            self.renderer.present()
+            return
+
+        if self.surface is not self.window:
+            src = self.surface
+            if self.scale_buf is not None:
+                if self.present_mode == "integer":
+                    pygame.transform.scale(self.surface, self.present_rect.size, self.scale_buf)
+                else:
+                    pygame.transform.smoothscale(self.surface, self.present_rect.size, self.scale_buf)
+                src = self.scale_buf
+            if self.canvas_alpha:
+                # translucent canvas pixels must not blend over the previous frame
+                self.window.fill((5, 6, 10), self.present_rect)
+            self.window.blit(src, self.present_rect)
         pygame.display.flip()
 
 
+def positive_float(text):
+    value = float(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+    return value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Top-down survival shooter")
+    parser.add_argument("--present", choices=PRESENT_MODES, default=PRESENT_MODE,
+                        help="how the virtual canvas is scaled to the window")
+    parser.add_argument("--opaque", action="store_true",
+                        help="drop SRCALPHA on the main canvas")
+    parser.add_argument("--telemetry", metavar="URL",
+                        help="export live metrics to file:///path, udp://host:port or unix:///path")
+    parser.add_argument("--telemetry-interval", type=positive_float, default=1.0, metavar="SECONDS",
+                        help="how often the exporter flushes batched records (the ring buffer holds two intervals)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    Game().run()
+    args = parse_args()
+    ring = None
+    if args.telemetry:
+        import telemetry
+
+        try:
+            sink = telemetry.open_sink(args.telemetry)
+        except ValueError as exc:
+            sys.exit(f"--telemetry: {exc}")
+        exporter = telemetry.Exporter(sink, args.telemetry_interval, records_per_s=FPS).start()
+        atexit.register(exporter.stop)
+        ring = exporter.buffer
+    Game(present_mode=args.present, canvas_alpha=CANVAS_ALPHA and not args.opaque, telemetry=ring).run()
@@ -0,0 +1,265 @@
+"""Low-overhead gameplay telemetry.
+
+The game only calls ``RingBuffer.record`` once per frame, which stores a tuple in a
+preallocated slot. A background ``Exporter`` thread drains the buffer every
+``interval`` seconds and writes InfluxDB line protocol to a sink:
+
+    file:///tmp/shooter.lp      append to a local file
+    udp://127.0.0.1:8094        datagrams to a UDP collector
+    unix:///tmp/shooter.sock    datagrams to a Unix socket collector
+
+Nothing ever blocks the game: if the exporter falls behind, the oldest records
+are overwritten, and if a socket sink is not ready the unsent part of the batch is
+dropped. Both are counted and reported on the next line as ``dropped``.
+
+The ring holds ``capacity`` records; by default it is sized to two flush intervals
+at ``records_per_s`` (the game passes its FPS), and never below 4096. A longer
+interval therefore needs more memory rather than silently losing records.
+
+A stand-in collector that prints what it receives:
+
+    python telemetry.py collect udp://127.0.0.1:8094
+"""
+import argparse
+import collections
+import os
+import socket
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+# order of the values passed to RingBuffer.record
+FIELDS = ("t", "frame_ms", "enemies", "bullets", "particles", "level", "combo", "hp", "spawns")
+INT_FIELDS = ("enemies", "bullets", "particles", "level", "hp", "spawns")
+MEASUREMENT = "shooter"
+MAX_DATAGRAM = 1400  # stay under a typical MTU
+MIN_CAPACITY = 4096
+
+
+# ---------------------------
+# Ring buffer (hot path)
+# ---------------------------
+class RingBuffer:
+    def __init__(self, capacity=MIN_CAPACITY):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0  # total records written; only the game thread moves it
+        self.tail = 0  # total records consumed; only the exporter moves it
+
+    def record(self, rec):
+        self.slots[self.head % self.capacity] = rec
+        self.head += 1
+
+    def drain(self):
+        """Return (records, overwritten) since the last drain."""
+        head = self.head
+        start = max(self.tail, head - self.capacity)
+        overwritten = start - self.tail
+        cap = self.capacity
+        slots = self.slots
+        out = [slots[i % cap] for i in range(start, head)]
+        # the game thread may have lapped us while copying: slots below
+        # new_head - cap now hold newer records, so count those as lost.
+        # record() stores into slots[head % cap] before bumping head, so the
+        # slot at new_head - cap may already hold the next record too; treat
+        # it as lost as well (+1). This only costs a record once we are
+        # already overflowing.
+        lapped = self.head + 1 - cap - start
+        if lapped > 0:
+            lapped = min(lapped, len(out))
+            del out[:lapped]
+            overwritten += lapped
+        self.tail = head
+        return out, overwritten
+
+
+# ---------------------------
+# Sinks
+# ---------------------------
+class FileSink:
+    def __init__(self, path):
+        self.f = open(path, "a", encoding="utf-8")
+
+    def write(self, lines):
+        """Return the number of lines written."""
+        self.f.write("".join(lines))
+        self.f.flush()
+        return len(lines)
+
+    def close(self):
+        self.f.close()
+
+
+class DatagramSink:
+    """Non-blocking UDP or Unix datagram sink; a full or missing peer drops the rest of the batch."""
+
+    def __init__(self, family, addr):
+        self.addr = addr
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+
+    def write(self, lines):
+        """Return the number of lines sent before the first failed datagram."""
+        sent = 0
+        for packet, count in pack_datagrams(lines):
+            try:
+                self.sock.sendto(packet, self.addr)
+            except OSError:  # BlockingIOError, ConnectionRefusedError, FileNotFoundError, ...
+                break
+            sent += count
+        return sent
+
+    def close(self):
+        self.sock.close()
+
+
+def pack_datagrams(lines):
+    """Yield (packet, line_count) pairs of whole lines up to MAX_DATAGRAM bytes."""
+    packet = b""
+    count = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        if packet and len(packet) + len(data) > MAX_DATAGRAM:
+            yield packet, count
+            packet = b""
+            count = 0
+        packet += data
+        count += 1
+    if packet:
+        yield packet, count
+
+
+def open_sink(url):
+    u = urlparse(url)
+    if u.scheme in ("file", "unix"):
+        path = u.netloc + u.path
+        if not path:
+            raise ValueError(f"telemetry sink {url!r} needs a path")
+        if u.scheme == "file":
+            return FileSink(path)
+        return DatagramSink(socket.AF_UNIX, path)
+    if u.scheme == "udp":
+        try:
+            port = u.port
+        except ValueError:
+            port = None
+        if not u.hostname or port is None:
+            raise ValueError(f"telemetry sink {url!r} needs udp://host:port")
+        return DatagramSink(socket.AF_INET, (u.hostname, port))
+    raise ValueError(f"unsupported telemetry sink {url!r} (use file://, udp:// or unix://)")
+
+
+# ---------------------------
+# Exporter (background thread)
+# ---------------------------
+def format_line(rec, tags, extra):
+    fields = []
+    for name, value in zip(FIELDS[1:], rec[1:]):
+        if name in INT_FIELDS:
+            fields.append(f"{name}={int(value)}i")
+        else:
+            fields.append(f"{name}={value:.3f}")
+    for name, value in extra:
+        fields.append(f"{name}={value}")
+    return f"{MEASUREMENT},{tags} {','.join(fields)} {int(rec[0] * 1e9)}\n"
+
+
+class Exporter:
+    def __init__(self, sink, interval=1.0, capacity=None, records_per_s=120, session=None):
+        if interval <= 0:
+            sink.close()  # we were handed ownership; don't leak the file/socket
+            raise ValueError(f"telemetry interval must be positive, got {interval!r}")
+        if capacity is None:
+            capacity = max(MIN_CAPACITY, int(interval * records_per_s * 2))
+        self.sink = sink
+        self.interval = interval
+        self.buffer = RingBuffer(capacity)
+        self.tags = f"session={session or f'{os.getpid()}-{int(time.time())}'}"
+        self.dropped = 0
+        self.spawn_window = collections.deque()  # (t, spawns) over the last second
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="telemetry-exporter", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread.ident is None:
+            self.sink.close()  # never started; nothing else owns the sink
+        else:
+            # the thread closes the sink after its final flush; if the sink is
+            # slow the join times out and the daemon thread finishes on its own
+            self.thread.join(self.interval + 1.0)
+
+    def run(self):
+        try:
+            while not self.stop_event.wait(self.interval):
+                self.flush()
+            self.flush()
+        finally:
+            self.sink.close()
+
+    def spawns_per_s(self, t, spawns):
+        window = self.spawn_window
+        if window and spawns < window[-1][1]:
+            window.clear()  # game restarted; counter reset
+        window.append((t, spawns))
+        while t - window[0][0] > 1.0:
+            window.popleft()
+        # a window shorter than a second (just started or reset) still averages over 1 s
+        return (spawns - window[0][1]) / max(t - window[0][0], 1.0)
+
+    def flush(self):
+        records, overwritten = self.buffer.drain()
+        self.dropped += overwritten
+        if not records:
+            return
+        lines = []
+        for rec in records:
+            rate = self.spawns_per_s(rec[0], rec[-1])
+            lines.append(format_line(rec, self.tags, (("spawns_per_s", f"{rate:.2f}"), ("dropped", f"{self.dropped}i"))))
+        try:
+            sent = self.sink.write(lines)
+        except OSError:
+            sent = 0
+        self.dropped += len(records) - sent
+
+
+# ---------------------------
+# Stand-in collector
+# ---------------------------
+def collect(url, out=sys.stdout):
+    u = urlparse(url)
+    if u.scheme == "udp":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((u.hostname, u.port))
+    elif u.scheme == "unix":
+        path = u.netloc + u.path
+        if os.path.exists(path):
+            os.unlink(path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(path)
+    else:
+        raise ValueError(f"collector needs a udp:// or unix:// address, got {url!r}")
+    try:
+        while True:
+            data = sock.recv(65536)
+            out.write(data.decode("utf-8"))
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Telemetry stand-in collector")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("collect", help="print line-protocol records received on a socket")
+    c.add_argument("url", help="udp://host:port or unix:///path")
+    args = parser.parse_args()
+    if args.cmd == "collect":
+        collect(args.url)